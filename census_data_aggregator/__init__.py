@@ -1,10 +1,57 @@
+import bisect
+import collections.abc
+import concurrent.futures
+import functools
+import itertools
 import math
+import multiprocessing
+import operator
+import os
 import warnings
 
 import numpy
 
 from .exceptions import DataError, SamplingPercentageWarning
 
+try:
+    from numba import njit as _njit
+    from numba import prange as _prange
+
+    _searchsorted = numpy.searchsorted
+except ImportError:
+    # numba is optional. Without it, the functions it would compile run as regular Python.
+    def _njit(*args, **kwargs):
+        return lambda func: func
+
+    _prange = range
+
+    # The standard library's binary search skips NumPy's call overhead, most of the cost on arrays as short as a range list
+    _searchsorted = bisect.bisect_left
+
+
+# The z-score the Census Bureau uses to turn 90% margins of error into standard errors and back.
+# It's rounded the same way the bureau rounds it, so published margins convert exactly.
+_Z90 = 1.645
+
+# The most pairs approximate_sum totals in pure Python before switching to NumPy
+_SUM_ARRAY_MIN_PAIRS = 64
+
+# The most ranges approximate_median works through in pure Python before switching to NumPy
+_MEDIAN_ARRAY_MIN_RANGES = 64
+
+# A shared random number generator for simulations run without a seed
+_RNG = numpy.random.default_rng()
+
+# The fewest values in approximate_mean's uniform bins that get summed with a normal
+# approximation rather than drawn one by one
+_UNIFORM_APPROXIMATION_MIN_N = 32
+
+# The same for its Pareto bin
+_PARETO_APPROXIMATION_MIN_N = 10_000
+
+# The most Pareto values a thread draws at once, which keeps each one's memory use to half a megabyte
+_PARETO_DRAW_CHUNK = 2**16
+
 
 def approximate_sum(*pairs):
     """Sum estimates from the U.S. Census Bureau and approximate the combined margin of error.
@@ -36,30 +83,150 @@ def approximate_sum(*pairs):
     .. _official guidelines:
         https://www.documentcloud.org/documents/6162551-20180418-MOE.html
     """
-    # According to the Census Bureau, when approximating a sum use only the largest zero estimate margin of error, once
-    # https://www.documentcloud.org/documents/6162551-20180418-MOE.html#document/p52
-    zeros = [p for p in pairs if p[0] == 0]
-    # So if there are zeros...
-    if len(zeros) > 1:
-        # ... weed them out
-        max_zero_margin = max(p[1] for p in zeros)
-        not_zero_margins = [p[1] for p in pairs if p[0] != 0]
-        margins = [max_zero_margin] + not_zero_margins
-    # If not, just keep all the input margins
-    else:
-        margins = [p[1] for p in pairs]
+    # Long lists of pairs are quicker to total with NumPy, as a batch of one. Splitting the
+    # estimates from the margins keeps integer estimates as integers.
+    if len(pairs) > _SUM_ARRAY_MIN_PAIRS:
+        estimates, margins = zip(*pairs)
+        totals, margins_of_error = approximate_sum_batch([estimates], [margins])
+        return totals.item(), margins_of_error.item()
+
+    # The most common case, a pair of nonzero estimates, is a single call
+    if len(pairs) == 2:
+        (first_estimate, first_margin), (second_estimate, second_margin) = pairs
+        if first_estimate != 0 and second_estimate != 0:
+            return first_estimate + second_estimate, math.hypot(
+                first_margin, second_margin
+            )
+
+    # Otherwise tally up the estimates and margins in a single pass
+    total = 0
+    squared_margins = 0.0
+    max_zero_margin = 0.0
+    for estimate, margin in pairs:
+        total += estimate
+        # According to the Census Bureau, when approximating a sum use only the largest zero estimate margin of error, once
+        # https://www.documentcloud.org/documents/6162551-20180418-MOE.html#document/p52
+        if estimate == 0:
+            if margin > max_zero_margin:
+                max_zero_margin = margin
+        else:
+            squared_margins += margin * margin
 
-    # Calculate the margin using the bureau's official formula
-    margin_of_error = math.sqrt(sum(m**2 for m in margins))
+    # Then add back the largest of the zero margins. When there's only one it's the same
+    # as keeping every input margin, and when there are none it adds nothing.
+    squared_margins += max_zero_margin * max_zero_margin
 
-    # Calculate the total
-    total = sum(p[0] for p in pairs)
+    # Calculate the margin using the bureau's official formula
+    margin_of_error = math.sqrt(squared_margins)
 
     # Return the results
     return total, margin_of_error
 
 
-def approximate_median(range_list, design_factor=1, sampling_percentage=None):
+def approximate_sum_batch(estimates, moes, group_ids=None):
+    """Sum many groups of estimates at once and approximate their combined margins of error.
+
+    A vectorized version of `approximate_sum` that replaces a Python loop over groups, like
+    totaling the tracts of every county in a state. Each group follows the same rules as
+    `approximate_sum`, including using only the largest zero estimate margin of error, once.
+
+    Args:
+        estimates (numpy.ndarray): The U.S. Census bureau estimates to total. Either a two-dimensional
+            array with one row per group, or a flat array with the group of each value in `group_ids`.
+        moes (numpy.ndarray): The margins of error of the estimates, in the same shape.
+        group_ids (numpy.ndarray, optional): A flat array with the group each estimate belongs to.
+            The results come back in the order of the sorted unique ids, like `numpy.unique` returns them.
+
+    Returns:
+        A two-item tuple with an array of summed totals followed by an array of their approximated
+        margins of error.
+
+        (array([19866960]), array([5437.75735023]))
+
+    Examples:
+        Totaling the under-five population from males and females, one row per geography.
+
+        >>> approximate_sum_batch([[10154024, 9712936]], [[3778, 3911]])
+        (array([19866960]), array([5437.75735023]))
+
+        The same from a flat list of values tagged with their geography.
+
+        >>> approximate_sum_batch([10154024, 9712936], [3778, 3911], group_ids=["US", "US"])
+        (array([19866960]), array([5437.75735023]))
+    """
+    # Pull out the values, keeping integer totals as integers
+    estimates = numpy.asarray(estimates)
+    moes = numpy.asarray(moes, dtype=numpy.float64)
+
+    # Split the margins of zero estimates away from the rest, since only the largest of them counts
+    zeros = estimates == 0
+    zero_moes = numpy.where(zeros, moes, 0)
+    nonzero_moes = numpy.where(zeros, 0, moes)
+
+    if group_ids is None:
+        # Each row is already a group
+        totals = estimates.sum(axis=1)
+        squared_moes = numpy.einsum("gk,gk->g", nonzero_moes, nonzero_moes)
+        max_zero_moes = zero_moes.max(axis=1)
+    else:
+        # Line the values up so each group's are next to each other, then reduce each run
+        order = numpy.argsort(group_ids, kind="stable")
+        _, starts = numpy.unique(numpy.asarray(group_ids)[order], return_index=True)
+        nonzero_moes = nonzero_moes[order]
+        totals = numpy.add.reduceat(estimates[order], starts)
+        squared_moes = numpy.add.reduceat(nonzero_moes * nonzero_moes, starts)
+        max_zero_moes = numpy.maximum.reduceat(zero_moes[order], starts)
+
+    # Add back the largest zero estimate margin in each group. It's zero in groups without any.
+    squared_moes += max_zero_moes * max_zero_moes
+
+    # Calculate the margins using the bureau's official formula
+    return totals, numpy.sqrt(squared_moes)
+
+
+def _columns(range_list, *keys):
+    """Pull each of the submitted keys out of a range list as a tuple of its values.
+
+    The range list can be a list of dictionaries or a dictionary of equal-length sequences,
+    like a column of NumPy arrays for each key.
+    """
+    if isinstance(range_list, collections.abc.Mapping):
+        columns = tuple(tuple(numpy.asarray(range_list[key]).tolist()) for key in keys)
+        # Every range needs a value in each column
+        if len(set(map(len, columns))) > 1:
+            lengths = ", ".join(
+                f"{len(column)} {key}" for key, column in zip(keys, columns)
+            )
+            raise DataError(f"The columns must all be the same length, not {lengths}.")
+        return columns
+    return tuple(tuple(map(operator.itemgetter(key), range_list)) for key in keys)
+
+
+@functools.lru_cache(maxsize=128)
+def _ingest(columns):
+    """Convert a tuple of min, max, n and moe columns into arrays sorted by their minimums.
+
+    Cached so pipelines that submit the same ranges over and over only convert them once.
+    The arrays are shared between calls, so they are made read-only.
+    """
+    table = numpy.array(columns, dtype=numpy.float64).reshape(4, -1)
+    table = table[:, numpy.argsort(table[0], kind="stable")]
+    table.flags.writeable = False
+    return tuple(table)
+
+
+def _warn_sampling_percentage(sampling_percentage, warn):
+    """Warn that no margin of error can be calculated without a sampling percentage.
+
+    The warning points at the code that called the public function, not this module.
+    """
+    if warn and not sampling_percentage:
+        warnings.warn("", SamplingPercentageWarning, stacklevel=3)
+
+
+def approximate_median(
+    range_list, design_factor=1, sampling_percentage=None, warn=True
+):
     """Estimate a median and approximate the margin of error.
 
     Follows the U.S. Census Bureau's `official guidelines`_ for estimation using a design factor.
@@ -67,6 +234,7 @@ def approximate_median(range_list, design_factor=1, sampling_percentage=None):
 
     Args:
         range_list (list): A list of dictionaries that divide the full range of data values into continuous categories.
+            It can also be a dictionary of equal-length sequences, like NumPy arrays, for each key.
             Each dictionary should have three keys:
                 * min (int): The minimum value of the range
                 * max (int): The maximum value of the range
@@ -86,6 +254,8 @@ def approximate_median(range_list, design_factor=1, sampling_percentage=None):
             * Three-year ACS: 7.5
             * Five-year ACS: 12.5
          If you do not provide this input, a margin of error will not be returned.
+        warn (bool, optional): Set to False to skip the warning about a missing sampling percentage,
+            like when only the medians are wanted. Defaults to True.
 
     Returns:
         A two-item tuple with the median followed by the approximated margin of error.
@@ -124,124 +294,594 @@ def approximate_median(range_list, design_factor=1, sampling_percentage=None):
     ... _the bureau's reference material:
         https://www.census.gov/programs-surveys/acs/technical-documentation/pums/documentation.html
     """
-    # Sort the list
-    range_list.sort(key=lambda x: x["min"])
+    # If there's no sampling percentage, we can't calculate a margin of error, but still return the median
+    _warn_sampling_percentage(sampling_percentage, warn)
+
+    # A short list is quicker to work through in pure Python than to convert into arrays
+    if (
+        not isinstance(range_list, collections.abc.Mapping)
+        and len(range_list) <= _MEDIAN_ARRAY_MIN_RANGES
+    ):
+        return _approximate_median_short(
+            map(operator.itemgetter("min", "max", "n"), range_list),
+            design_factor,
+            sampling_percentage,
+        )
+
+    # Look longer ones up by value, since the same ones often come back again and again
+    return _approximate_median(
+        *_columns(range_list, "min", "max", "n"),
+        design_factor,
+        sampling_percentage,
+    )
+
+
+def _approximate_median_short(ranges, design_factor, sampling_percentage):
+    """Estimate a median from (min, max, n) tuples with lists in place of arrays.
+
+    Takes the same steps as `_prepare` and `_percentile_core`, in the same order, so the results match theirs.
+    The values are left as they were submitted rather than converted to floats, which gives the same
+    answers for any count below 2 ** 53.
+    """
+    # Sort the ranges by their minimums
+    ranges = sorted(ranges, key=operator.itemgetter(0))
+    if not ranges:
+        raise DataError("At least one range must be provided.")
+    mins, maxs, ns = zip(*ranges)
 
     # For each range calculate its min and max value along the universe's scale
-    cumulative_n = 0
-    for range_ in range_list:
-        range_["n_min"] = cumulative_n
-        cumulative_n += range_["n"]
-        range_["n_max"] = cumulative_n
+    n_max = list(itertools.accumulate(ns))
+    n_min = [0, *n_max[:-1]]
 
     # What is the total number of observations in the universe?
-    n = sum(d["n"] for d in range_list)
+    n = n_max[-1]
+    if n <= 0:
+        raise DataError("The ranges must contain at least one observation.")
+
+    # Find the range that contains the midpoint of the n and estimate the median within it
+    n_midpoint = n * 0.5
+    i = bisect.bisect_left(n_max, n_midpoint)
+    estimated_median = mins[i] + (maxs[i] - mins[i]) * ((n_midpoint - n_min[i]) / ns[i])
 
-    # What is the estimated midpoint of the n?
-    n_midpoint = n / 2.0
+    # Without a standard error there's no margin of error to return
+    standard_error = float(_standard_error(n, design_factor, sampling_percentage))
+    if math.isnan(standard_error):
+        return _checked_result(estimated_median, math.nan, math.nan, math.nan, n)
 
-    # Now use those to determine which group contains the midpoint.
-    n_midpoint_range = next(
-        d for d in range_list if n_midpoint >= d["n_min"] and n_midpoint <= d["n_max"]
+    # Estimate the p_lower and p_upper n values and make sure they fall within the ranges
+    p_lower = 0.5 - standard_error
+    p_upper = 0.5 + standard_error
+    p_lower_n = n * p_lower
+    p_upper_n = n * p_upper
+    if not (0 <= p_lower_n <= n and 0 <= p_upper_n <= n):
+        return _checked_result(estimated_median, math.nan, p_lower_n, p_upper_n, n)
+
+    # Interpolate the lower and upper bounds of the confidence interval, as in _p_value_bound
+    bounds = []
+    for p, p_n in ((p_lower, p_lower_n), (p_upper, p_upper_n)):
+        i = bisect.bisect_left(n_max, p_n)
+        while n_max[i] == n_min[i]:
+            i += 1
+        a1 = mins[i]
+        a2 = mins[i + 1] if i + 1 < len(mins) else maxs[i]
+        c1 = n_min[i] / n
+        c2 = n_min[i + 1] / n if i + 1 < len(mins) else n_max[i] / n
+        bounds.append(((p - c1) / (c2 - c1)) * (a2 - a1) + a1)
+    lower_bound, upper_bound = bounds
+
+    # Calculate the margin of error at the 90% confidence level from the standard error of the median
+    margin_of_error = _Z90 * (0.5 * (upper_bound - lower_bound))
+    return _checked_result(estimated_median, margin_of_error, p_lower_n, p_upper_n, n)
+
+
+@functools.lru_cache(maxsize=1024)
+def _approximate_median(mins, maxs, ns, design_factor, sampling_percentage):
+    """Estimate a median from tuples of its ranges' values.
+
+    Cached so dashboards and pipelines that recalculate the same medians get them back without any math.
+    """
+    prepared = _prepare(mins, maxs, ns)
+    return _median_result(
+        prepared,
+        _standard_error(prepared[-1][-1], design_factor, sampling_percentage),
     )
 
-    # How many households in the midrange are needed to reach the midpoint?
-    n_midrange_gap = n_midpoint - n_midpoint_range["n_min"]
 
-    # What is the proportion of the group that would be needed to get the midpoint?
-    n_midrange_gap_percent = n_midrange_gap / n_midpoint_range["n"]
+@functools.lru_cache(maxsize=128)
+def _schema(mins, maxs):
+    """Work out the order that sorts a set of ranges by their minimums.
 
-    # Apply this proportion to the width of the midrange
-    n_midrange_gap_adjusted = (
-        n_midpoint_range["max"] - n_midpoint_range["min"]
-    ) * n_midrange_gap_percent
+    Cached because the same ranges, like a table's income brackets, usually come back for every geography.
+    Returns the order along with the sorted minimums and maximums, all read-only since they are shared.
+    """
+    mins = numpy.array(mins, dtype=numpy.float64)
+    order = numpy.argsort(mins, kind="stable")
+    mins = mins[order]
+    maxs = numpy.array(maxs, dtype=numpy.float64)[order]
+    for array in (order, mins, maxs):
+        array.flags.writeable = False
+    return order, mins, maxs
 
-    # Estimate the median
-    estimated_median = n_midpoint_range["min"] + n_midrange_gap_adjusted
 
-    # If there's no sampling percentage, we can't calculate a margin of error
+def prepare_range_list(range_list):
+    """Convert a range list into the arrays `approximate_median_prepared` works from.
+
+    Sorts the ranges and totals up their n values so the work can be done once and reused, like
+    when estimating the same geography's median with different sampling percentages. The sort is
+    cached for each set of range boundaries, so preparing the ranges of many geographies that
+    share the same categories only sorts them once.
+
+    Args:
+        range_list (list): A list of dictionaries with min, max and n keys, or a dictionary of sequences, as in `approximate_median`.
+
+    Returns:
+        A tuple of read-only arrays to pass to `approximate_median_prepared`.
+
+    Examples:
+        >>> prepared = prepare_range_list(household_income_2013_acs5)
+        >>> approximate_median_prepared(prepared, sampling_percentage=5*2.5)
+        (42211.096153846156, 4706.522752733644)
+    """
+    # Leave the submitted list as it was
+    return _prepare(*_columns(range_list, "min", "max", "n"))
+
+
+def _prepare(mins, maxs, ns):
+    """Convert tuples of a range list's values into the arrays `approximate_median_prepared` works from."""
+    order, mins, maxs = _schema(mins, maxs)
+
+    # Bail out before doing any math if there's nothing to find the middle of
+    if not len(mins):
+        raise DataError("At least one range must be provided.")
+
+    # For each range calculate its min and max value along the universe's scale
+    ns = numpy.array(ns, dtype=numpy.float64)[order]
+    n_max = numpy.cumsum(ns)
+    n_min = numpy.empty_like(n_max)
+    n_min[0] = 0
+    n_min[1:] = n_max[:-1]
+
+    # What is the total number of observations in the universe?
+    if n_max[-1] <= 0:
+        raise DataError("The ranges must contain at least one observation.")
+
+    for array in (ns, n_min, n_max):
+        array.flags.writeable = False
+    return mins, maxs, ns, n_min, n_max
+
+
+def approximate_median_prepared(
+    prepared, design_factor=1, sampling_percentage=None, warn=True
+):
+    """Estimate a median and approximate the margin of error from a prepared range list.
+
+    The same as `approximate_median`, but starting from the output of `prepare_range_list`.
+
+    Args:
+        prepared (tuple): The arrays returned by `prepare_range_list`.
+        design_factor (float, optional): The design factor, as in `approximate_median`.
+        sampling_percentage (float, optional): The sampling percentage, as in `approximate_median`.
+            If you do not provide this input, a margin of error will not be returned.
+        warn (bool, optional): Whether to warn about a missing sampling percentage, as in `approximate_median`.
+
+    Returns:
+        A two-item tuple with the median followed by the approximated margin of error.
+
+        (42211.096153846156, 4706.522752733644)
+
+    Examples:
+        >>> prepared = prepare_range_list(household_income_2013_acs5)
+        >>> approximate_median_prepared(prepared, sampling_percentage=5*2.5)
+        (42211.096153846156, 4706.522752733644)
+    """
+    # If there's no sampling percentage, we can't calculate a margin of error, but still return the median
+    _warn_sampling_percentage(sampling_percentage, warn)
+
+    return _median_result(
+        prepared,
+        _standard_error(prepared[-1][-1], design_factor, sampling_percentage),
+    )
+
+
+def approximate_percentiles(
+    range_list, percentiles, design_factor=1, sampling_percentage=None, warn=True
+):
+    """Estimate percentiles, like the quartiles, and approximate their margins of error.
+
+    Extends the method `approximate_median` follows to other points in the ranges, using the standard error
+    of the proportion each percentile marks in place of the median's 50 percent. The ranges are sorted and
+    totaled once for all of the percentiles.
+
+    Args:
+        range_list (list): A list of dictionaries with min, max and n keys, or a dictionary of sequences, as in `approximate_median`.
+        percentiles (list): The percentiles to estimate, each between 0 and 100. Pass 25, 50 and 75 for the quartiles.
+        design_factor (float, optional): The design factor, as in `approximate_median`.
+        sampling_percentage (float, optional): The sampling percentage, as in `approximate_median`.
+            If you do not provide this input, margins of error will not be returned.
+        warn (bool, optional): Whether to warn about a missing sampling percentage, as in `approximate_median`.
+
+    Returns:
+        A list with a two-item tuple for each percentile, with the estimate followed by the approximated margin of error.
+
+        [(22699.80836236934, 1493.065750018612), (42211.096153846156, 4706.522752733644), (74829.5197740113, 7702.715349082209)]
+
+    Examples:
+        >>> approximate_percentiles(household_income_2013_acs5, [25, 50, 75], sampling_percentage=5*2.5)
+        [(22699.80836236934, 1493.065750018612), (42211.096153846156, 4706.522752733644), (74829.5197740113, 7702.715349082209)]
+    """
+    # If there's no sampling percentage, we can't calculate a margin of error, but still return the percentiles
+    _warn_sampling_percentage(sampling_percentage, warn)
+
+    prepared = prepare_range_list(range_list)
+    results = []
+    for percentile in percentiles:
+        if not 0 < percentile < 100:
+            raise ValueError(
+                f"The percentiles must be between 0 and 100, not {percentile!r}."
+            )
+        standard_error = _standard_error(
+            prepared[-1][-1], design_factor, sampling_percentage, percentile
+        )
+        results.append(_median_result(prepared, standard_error, percentile / 100))
+    return results
+
+
+def _standard_error(n, design_factor, sampling_percentage, percentile=50):
+    """Get the standard error for a universe of n observations, or NaN without a sampling percentage.
+
+    For the median that's the standard error of a 50 percent proportion, and for other percentiles the proportion they mark.
+    The n can be a single number or an array of them.
+    """
     if not sampling_percentage:
-        # Let's throw a warning, but still return the median
-        warnings.warn("", SamplingPercentageWarning)
-        return estimated_median, None
+        return math.nan
+
+    # Outside this range the formula takes the square root of a negative number
+    if not 0 < sampling_percentage <= 100:
+        raise ValueError(
+            f"The sampling percentage must be greater than 0 and at most 100, not {sampling_percentage}."
+        )
 
-    # Get the standard error for this dataset
-    standard_error = (
+    return (
         design_factor
-        * math.sqrt(
-            ((100 - sampling_percentage) / (n * sampling_percentage)) * (50**2)
+        * numpy.sqrt(
+            ((100 - sampling_percentage) / (n * sampling_percentage))
+            * (percentile * (100 - percentile))
         )
     ) / 100
 
-    # Use the standard error to calculate the p values
-    p_lower = 0.5 - standard_error
-    p_upper = 0.5 + standard_error
 
-    # Estimate the p_lower and p_upper n values
-    p_lower_n = n * p_lower
-    p_upper_n = n * p_upper
+def make_median_estimator(design_factor=1, sampling_percentage=None, warn=True):
+    """Create a function that runs `approximate_median` with a fixed design factor and sampling percentage.
+
+    Useful when estimating medians for a long list of geographies from the same survey. The returned
+    function gives the same results as `approximate_median`, and shares its cache.
+
+    Args:
+        design_factor (float, optional): The design factor, as in `approximate_median`.
+        sampling_percentage (float, optional): The sampling percentage, as in `approximate_median`.
+        warn (bool, optional): Whether to warn about a missing sampling percentage, as in `approximate_median`.
+
+    Returns:
+        A function that accepts a range list and returns a two-item tuple with the median
+        followed by the approximated margin of error.
+
+    Examples:
+        >>> estimate_median = make_median_estimator(sampling_percentage=5*2.5)
+        >>> estimate_median(household_income_2013_acs5)
+        (42211.096153846156, 4706.522752733644)
+    """
+    return functools.partial(
+        approximate_median,
+        design_factor=design_factor,
+        sampling_percentage=sampling_percentage,
+        warn=warn,
+    )
+
+
+def approximate_median_many(
+    range_lists, design_factor=1, sampling_percentage=None, workers=1, warn=True
+):
+    """Estimate the medians of many range lists at once, optionally spread across processes.
+
+    A convenience for large jobs, like every tract in a state, that runs `approximate_median` on each
+    range list, in the current process or a pool of worker processes. The range lists are left as they
+    were submitted.
+
+    Sending the range lists to other processes costs about as much as working them out, so extra
+    workers only pay off on long lists of large inputs. The workers are started fresh rather than
+    forked, so a script that uses them must guard its entry point with ``if __name__ == "__main__":``.
+
+    Args:
+        range_lists (list): A list of range lists, each as in `approximate_median`.
+        design_factor (float, optional): The design factor, as in `approximate_median`.
+        sampling_percentage (float, optional): The sampling percentage, as in `approximate_median`.
+            If you do not provide this input, margins of error will not be returned.
+        workers (int, optional): How many processes to run. Defaults to one, which runs everything in the
+            current process. Pass None to use every processor.
+        warn (bool, optional): Whether to warn about a missing sampling percentage, as in `approximate_median`.
+
+    Returns:
+        A list with a two-item tuple for each range list, with the median followed by the
+        approximated margin of error.
+
+        [(42211.096153846156, 4706.522752733644), ...]
+
+    Examples:
+        >>> approximate_median_many(list_of_range_lists, sampling_percentage=5*2.5)
+        [(42211.096153846156, 4706.522752733644), ...]
+
+        Spread across every processor.
+
+        >>> if __name__ == "__main__":
+        ...     approximate_median_many(list_of_range_lists, sampling_percentage=5*2.5, workers=None)
+
+        The same as running `approximate_median` through an executor of your own, which needs a
+        `functools.partial` rather than a lambda since the function is sent to other processes.
+
+        >>> estimate = functools.partial(approximate_median, sampling_percentage=5*2.5)
+        >>> with concurrent.futures.ProcessPoolExecutor() as executor:
+        ...     medians = list(executor.map(estimate, list_of_range_lists))
+    """
+    range_lists = list(range_lists)
+
+    # Warn about a missing sampling percentage once here, rather than for every range list
+    _warn_sampling_percentage(sampling_percentage, warn)
+    estimate = functools.partial(
+        approximate_median,
+        design_factor=design_factor,
+        sampling_percentage=sampling_percentage,
+        warn=False,
+    )
 
-    # Find the ranges the p values fall within
-    try:
-        p_lower_range_i, p_lower_range = next(
-            (i, d)
-            for i, d in enumerate(range_list)
-            if p_lower_n >= d["n_min"] and p_lower_n <= d["n_max"]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return list(map(estimate, range_lists))
+
+    # Start the workers from a clean server process where the platform offers one. Forking this one
+    # can leave them stuck on locks held by the threads numba runs approximate_median_batch on.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+    else:
+        context = multiprocessing.get_context("spawn")
+
+    # Hand the lists out in a few big chunks so the cost of sending them between processes is spread out
+    chunksize = max(1, len(range_lists) // (workers * 4))
+    with concurrent.futures.ProcessPoolExecutor(
+        workers, mp_context=context
+    ) as executor:
+        return list(executor.map(estimate, range_lists, chunksize=chunksize))
+
+
+def approximate_median_batch(
+    mins,
+    maxs,
+    ns,
+    design_factor=1,
+    sampling_percentage=None,
+    warn=True,
+    raise_errors=True,
+):
+    """Estimate the medians of many geographies that share the same ranges, all at once.
+
+    A vectorized version of `approximate_median` for tables like household income, where every
+    geography counts its units in the same set of ranges. The ranges are sorted once for the whole
+    batch. With numba installed, the rows are worked through in parallel threads.
+
+    Args:
+        mins (numpy.ndarray): The minimum value of each range.
+        maxs (numpy.ndarray): The maximum value of each range.
+        ns (numpy.ndarray): A two-dimensional array with a row for each geography and a column for each range,
+            holding the number of people, households or other units in it.
+        design_factor (float, optional): The design factor, as in `approximate_median`.
+        sampling_percentage (float, optional): The sampling percentage, as in `approximate_median`.
+            If you do not provide this input, the margins of error will be NaN.
+        warn (bool, optional): Whether to warn about a missing sampling percentage, as in `approximate_median`.
+        raise_errors (bool, optional): Set to False to get NaN margins of error, rather than a DataError,
+            for rows whose p values fall outside the ranges, and NaN for both the median and margin of error
+            of rows without any observations. Defaults to True.
+
+    Returns:
+        A two-item tuple with an array of medians followed by an array of their approximated margins of error.
+
+        (array([42211.09615385]), array([4706.52275273]))
+
+    Examples:
+        >>> approximate_median_batch(
+            [bracket["min"] for bracket in household_income_2013_acs5],
+            [bracket["max"] for bracket in household_income_2013_acs5],
+            [[bracket["n"] for bracket in household_income_2013_acs5]],
+            sampling_percentage=5*2.5,
         )
-    except StopIteration:
+        (array([42211.09615385]), array([4706.52275273]))
+    """
+    # If there's no sampling percentage, we can't calculate a margin of error, but still return the medians
+    _warn_sampling_percentage(sampling_percentage, warn)
+
+    # Make sure every row has an n for each range
+    mins = tuple(numpy.asarray(mins).tolist())
+    maxs = tuple(numpy.asarray(maxs).tolist())
+    ns = numpy.asarray(ns, dtype=numpy.float64)
+    if ns.ndim != 2:
         raise DataError(
-            f"The n's lower p value {p_lower_n} does not fall within a data range."
+            f"The n values must be a two-dimensional array with a row for each geography, not {ns.ndim}-dimensional."
         )
-
-    try:
-        p_upper_range_i, p_upper_range = next(
-            (i, d)
-            for i, d in enumerate(range_list)
-            if p_upper_n >= d["n_min"] and p_upper_n <= d["n_max"]
+    if not len(mins) == len(maxs) == ns.shape[1]:
+        raise DataError(
+            f"There must be an n value in every row for each range, not {len(mins)} mins, {len(maxs)} maxs and {ns.shape[1]} n values."
         )
-    except StopIteration:
+
+    # Sort the ranges once for every row
+    order, mins, maxs = _schema(mins, maxs)
+    if not len(mins):
+        raise DataError("At least one range must be provided.")
+
+    # For each range calculate its min and max value along each universe's scale
+    ns = ns[:, order]
+    n_max = numpy.cumsum(ns, axis=1)
+    n_min = numpy.zeros_like(n_max)
+    n_min[:, 1:] = n_max[:, :-1]
+
+    # What is the total number of observations in each universe?
+    n = n_max[:, -1]
+    empty = ~(n > 0)
+    if empty.any():
+        if raise_errors:
+            raise DataError(
+                f"The ranges must contain at least one observation. Rows {numpy.flatnonzero(empty).tolist()} do not."
+            )
+        # Leave the empty rows out of the math entirely, since there's nothing to divide them by
+        rows = ~empty
+    else:
+        rows = slice(None)
+
+    # Work out every row's standard error in one go
+    standard_errors = numpy.full(
+        len(n[rows]), _standard_error(n[rows], design_factor, sampling_percentage)
+    )
+
+    # Empty rows keep NaN for both their median and margin of error
+    medians = numpy.full(len(n), numpy.nan)
+    margins_of_error = numpy.full(len(n), numpy.nan)
+    medians[rows], margins_of_error[rows] = _median_batch_core(
+        mins, maxs, ns[rows], n_min[rows], n_max[rows], standard_errors
+    )
+
+    # Make sure the p values fell within the ranges
+    if sampling_percentage and raise_errors:
+        invalid = numpy.isnan(margins_of_error)
+        if invalid.any():
+            raise DataError(
+                f"The p values do not fall within a data range in rows {numpy.flatnonzero(invalid).tolist()}."
+            )
+
+    # Return the result
+    return medians, margins_of_error
+
+
+def _median_result(prepared, standard_error, p=0.5):
+    """Run the numbers for a prepared range list's median, or the percentile at p, and check they came out usable.
+
+    Leaves warning about a missing sampling percentage to the public functions, since their results may be cached.
+    """
+    return _checked_result(
+        *_percentile_core(*prepared, p, float(standard_error)), prepared[-1][-1]
+    )
+
+
+def _checked_result(estimated_median, margin_of_error, p_lower_n, p_upper_n, n):
+    """Check what `_percentile_core` returned is usable and convert it into the public functions' result.
+
+    The margin of error is NaN without a standard error, which returns None for it, and when
+    a p value fell outside the ranges, which raises a DataError.
+    """
+    # Without a standard error there are no p values, and no margin of error to return
+    if math.isnan(p_lower_n):
+        return float(estimated_median), None
+
+    # Make sure the p values fell within the ranges
+    if math.isnan(margin_of_error):
+        if not 0 <= p_lower_n <= n:
+            raise DataError(
+                f"The n's lower p value {p_lower_n} does not fall within a data range."
+            )
+        if not 0 <= p_upper_n <= n:
+            raise DataError(
+                f"The n's upper p value {p_upper_n} does not fall within a data range."
+            )
         raise DataError(
-            f"The n's upper p value {p_upper_n} does not fall within a data range."
+            "The margin of error could not be calculated from these ranges."
         )
 
-    # Use these values to estimate the lower bound of the confidence interval
-    p_lower_a1 = p_lower_range["min"]
-    try:
-        p_lower_a2 = range_list[p_lower_range_i + 1]["min"]
-    except IndexError:
-        p_lower_a2 = p_lower_range["max"]
-    p_lower_c1 = p_lower_range["n_min"] / n
-    try:
-        p_lower_c2 = range_list[p_lower_range_i + 1]["n_min"] / n
-    except IndexError:
-        p_lower_c2 = p_lower_range["n_max"] / n
-    lower_bound = ((p_lower - p_lower_c1) / (p_lower_c2 - p_lower_c1)) * (
-        p_lower_a2 - p_lower_a1
-    ) + p_lower_a1
-
-    # Same for the upper bound
-    p_upper_a1 = p_upper_range["min"]
-    try:
-        p_upper_a2 = range_list[p_upper_range_i + 1]["min"]
-    except IndexError:
-        p_upper_a2 = p_upper_range["max"]
-    p_upper_c1 = p_upper_range["n_min"] / n
-    try:
-        p_upper_c2 = range_list[p_upper_range_i + 1]["n_min"] / n
-    except IndexError:
-        p_upper_c2 = p_upper_range["n_max"] / n
-    upper_bound = ((p_upper - p_upper_c1) / (p_upper_c2 - p_upper_c1)) * (
-        p_upper_a2 - p_upper_a1
-    ) + p_upper_a1
+    # Return the result
+    return float(estimated_median), float(margin_of_error)
+
+
+@_njit(cache=True)
+def _p_value_bound(p, p_n, mins, maxs, n_min, n_max, n):
+    """Interpolate where a p value falls along the ranges' scale of values."""
+    i = _searchsorted(n_max, p_n)
+    # A p value of zero comes to rest on any empty ranges at the start,
+    # which have nothing to interpolate across, so move up to the first with anyone in it
+    while n_max[i] == n_min[i]:
+        i += 1
+    a1 = mins[i]
+    a2 = mins[i + 1] if i + 1 < len(mins) else maxs[i]
+    c1 = n_min[i] / n
+    c2 = n_min[i + 1] / n if i + 1 < len(mins) else n_max[i] / n
+    return ((p - c1) / (c2 - c1)) * (a2 - a1) + a1
+
+
+@_njit(cache=True)
+def _percentile_core(mins, maxs, ns, n_min, n_max, p, standard_error):
+    """Do the arithmetic behind `approximate_median` on the arrays from `prepare_range_list`.
+
+    Finds the value a share p of the way through the n, so 0.5 for the median. Kept free of
+    Python objects so numba can compile it when installed. Returns the estimate, its margin
+    of error and the n values of the lower and upper p values. The margin of error is NaN
+    when the standard error is NaN or a p value falls outside the ranges.
+    """
+    # What is the total number of observations in the universe?
+    n = n_max[-1]
+
+    # What is the estimated midpoint of the n? Or, for other percentiles, the point p of the way through it.
+    n_midpoint = n * p
+
+    # Now use those to determine which group contains the midpoint
+    i = _searchsorted(n_max, n_midpoint)
+
+    # How many households in the midrange are needed to reach the midpoint?
+    n_midrange_gap = n_midpoint - n_min[i]
+
+    # What is the proportion of the group that would be needed to get the midpoint?
+    n_midrange_gap_percent = n_midrange_gap / ns[i]
+
+    # Apply this proportion to the width of the midrange
+    n_midrange_gap_adjusted = (maxs[i] - mins[i]) * n_midrange_gap_percent
+
+    # Estimate the median
+    estimated_median = mins[i] + n_midrange_gap_adjusted
+
+    # Without a standard error we can't calculate a margin of error
+    if math.isnan(standard_error):
+        return estimated_median, math.nan, math.nan, math.nan
+
+    # Use the standard error to calculate the p values
+    p_lower = p - standard_error
+    p_upper = p + standard_error
+
+    # Estimate the p_lower and p_upper n values
+    p_lower_n = n * p_lower
+    p_upper_n = n * p_upper
+
+    # Make sure the p values fall within the ranges
+    if not (0 <= p_lower_n <= n and 0 <= p_upper_n <= n):
+        return estimated_median, numpy.nan, p_lower_n, p_upper_n
+
+    # Use these values to estimate the lower and upper bounds of the confidence interval
+    lower_bound = _p_value_bound(p_lower, p_lower_n, mins, maxs, n_min, n_max, n)
+    upper_bound = _p_value_bound(p_upper, p_upper_n, mins, maxs, n_min, n_max, n)
 
     # Calculate the standard error of the median
     standard_error_median = 0.5 * (upper_bound - lower_bound)
 
     # Calculate the margin of error at the 90% confidence level
-    margin_of_error = 1.645 * standard_error_median
+    margin_of_error = _Z90 * standard_error_median
+
+    return estimated_median, margin_of_error, p_lower_n, p_upper_n
 
-    # Return the result
-    return estimated_median, margin_of_error
+
+@_njit(cache=True, parallel=True)
+def _median_batch_core(mins, maxs, ns, n_min, n_max, standard_errors):
+    """Run `_percentile_core` for the median of every row of n values, split across threads when numba is installed."""
+    medians = numpy.empty(len(ns))
+    margins_of_error = numpy.empty(len(ns))
+    for row in _prange(len(ns)):
+        median, margin_of_error, p_lower_n, p_upper_n = _percentile_core(
+            mins, maxs, ns[row], n_min[row], n_max[row], 0.5, standard_errors[row]
+        )
+        medians[row] = median
+        margins_of_error[row] = margin_of_error
+    return medians, margins_of_error
 
 
 def approximate_proportion(numerator_pair, denominator_pair):
@@ -282,9 +922,10 @@ def approximate_proportion(numerator_pair, denominator_pair):
     # Approximate the proportion
     proportion_estimate = numerator_estimate / denominator_estimate
 
-    # Approximate the margin of error
-    squared_proportion_moe = numerator_moe**2 - (
-        proportion_estimate**2 * denominator_moe**2
+    # Approximate the margin of error, factoring the difference of squares to lose less precision
+    scaled_denominator_moe = proportion_estimate * denominator_moe
+    squared_proportion_moe = (numerator_moe - scaled_denominator_moe) * (
+        numerator_moe + scaled_denominator_moe
     )
     # Ensure it is greater than zero
     if squared_proportion_moe < 0:
@@ -297,6 +938,69 @@ def approximate_proportion(numerator_pair, denominator_pair):
     return proportion_estimate, proportion_moe
 
 
+def approximate_proportion_batch(
+    numerator_estimates,
+    numerator_moes,
+    denominator_estimates,
+    denominator_moes,
+    raise_errors=True,
+):
+    """Calculate many proportions at once and approximate their margins of error.
+
+    A vectorized version of `approximate_proportion` for aggregating many rows, like every
+    tract in a county, without a Python loop. Each argument is an array, or anything NumPy can
+    turn into one, and the rows are matched up element by element.
+
+    Args:
+        numerator_estimates (numpy.ndarray): The U.S. Census bureau estimates of the numerators.
+        numerator_moes (numpy.ndarray): The margins of error of the numerators.
+        denominator_estimates (numpy.ndarray): The U.S. Census bureau estimates of the denominators.
+        denominator_moes (numpy.ndarray): The margins of error of the denominators.
+        raise_errors (bool, optional): Set False to return NaN for the margins of error that
+            would be less than zero, which `approximate_proportion` rejects, rather than raising
+            a DataError. Defaults to True.
+
+    Returns:
+        A two-item tuple with an array of proportions followed by an array of their estimated
+        margins of error.
+
+        (array([0.32215645]), array([0.00802988]))
+
+    Examples:
+        >>> approximate_proportion_batch([203119], [5070], [630498], [837])
+        (array([0.32215645]), array([0.00802988]))
+    """
+    # Pull out the values
+    numerator_estimates = numpy.asarray(numerator_estimates, dtype=numpy.float64)
+    numerator_moes = numpy.asarray(numerator_moes, dtype=numpy.float64)
+    denominator_estimates = numpy.asarray(denominator_estimates, dtype=numpy.float64)
+    denominator_moes = numpy.asarray(denominator_moes, dtype=numpy.float64)
+
+    # Approximate the proportions
+    proportion_estimates = numerator_estimates / denominator_estimates
+
+    # Approximate the margins of error, factoring the difference of squares to lose less precision
+    scaled_denominator_moes = proportion_estimates * denominator_moes
+    squared_proportion_moes = (numerator_moes - scaled_denominator_moes) * (
+        numerator_moes + scaled_denominator_moes
+    )
+    # Ensure they are all greater than zero
+    invalid = squared_proportion_moes < 0
+    if invalid.any():
+        if raise_errors:
+            raise DataError(
+                f"The margin of error is less than zero in rows {numpy.flatnonzero(invalid).tolist()}. "
+                "Census experts advise using the approximate_ratio method instead."
+            )
+        squared_proportion_moes = numpy.where(
+            invalid, numpy.nan, squared_proportion_moes
+        )
+    proportion_moes = numpy.sqrt(squared_proportion_moes) / denominator_estimates
+
+    # Return the result
+    return proportion_estimates, proportion_moes
+
+
 def approximate_ratio(numerator_pair, denominator_pair):
     """Calculate the ratio between two estimates and approximate its margin of error.
 
@@ -328,16 +1032,59 @@ def approximate_ratio(numerator_pair, denominator_pair):
     # Approximate the ratio
     ratio_estimate = numerator_estimate / denominator_estimate
 
-    # Approximate the margin of error
-    squared_ratio_moe = numerator_moe**2 + (
-        ratio_estimate**2 * denominator_moe**2
+    # Approximate the margin of error, with hypot taking the square root of the summed squares
+    ratio_moe = (1.0 / denominator_estimate) * math.hypot(
+        numerator_moe, ratio_estimate * denominator_moe
     )
-    ratio_moe = (1.0 / denominator_estimate) * math.sqrt(squared_ratio_moe)
 
     # Return the result
     return ratio_estimate, ratio_moe
 
 
+def approximate_ratio_batch(
+    numerator_estimates, numerator_moes, denominator_estimates, denominator_moes
+):
+    """Calculate many ratios at once and approximate their margins of error.
+
+    A vectorized version of `approximate_ratio` for aggregating many rows without a Python loop.
+    Each argument is an array, or anything NumPy can turn into one, and the rows are matched up
+    element by element.
+
+    Args:
+        numerator_estimates (numpy.ndarray): The U.S. Census bureau estimates of the numerators.
+        numerator_moes (numpy.ndarray): The margins of error of the numerators.
+        denominator_estimates (numpy.ndarray): The U.S. Census bureau estimates of the denominators.
+        denominator_moes (numpy.ndarray): The margins of error of the denominators.
+
+    Returns:
+        A two-item tuple with an array of ratios followed by an array of their approximated
+        margins of error.
+
+        (array([1.11678376]), array([0.03905467]))
+
+    Examples:
+        >>> approximate_ratio_batch([226840], [5556], [203119], [5070])
+        (array([1.11678376]), array([0.03905467]))
+    """
+    # Pull out the values
+    numerator_estimates = numpy.asarray(numerator_estimates, dtype=numpy.float64)
+    numerator_moes = numpy.asarray(numerator_moes, dtype=numpy.float64)
+    denominator_estimates = numpy.asarray(denominator_estimates, dtype=numpy.float64)
+    denominator_moes = numpy.asarray(denominator_moes, dtype=numpy.float64)
+
+    # Approximate the ratios
+    ratio_estimates = numerator_estimates / denominator_estimates
+
+    # Approximate the margins of error
+    squared_ratio_moes = numerator_moes * numerator_moes + (
+        ratio_estimates * ratio_estimates * denominator_moes * denominator_moes
+    )
+    ratio_moes = numpy.sqrt(squared_ratio_moes) / denominator_estimates
+
+    # Return the result
+    return ratio_estimates, ratio_moes
+
+
 def approximate_product(pair_one, pair_two):
     """Calculates the product of two estimates and approximates its margin of error.
 
@@ -369,16 +1116,55 @@ def approximate_product(pair_one, pair_two):
     # Approximate the product
     product_estimate = estimate_one * estimate_two
 
-    # Approximate the margin of error
-    squared_product_moe = (estimate_one**2 * moe_two**2) + (
-        estimate_two**2 * moe_one**2
-    )
-    product_moe = math.sqrt(squared_product_moe)
+    # Approximate the margin of error, with hypot taking the square root of the summed squares
+    product_moe = math.hypot(estimate_one * moe_two, estimate_two * moe_one)
 
     # Return the results
     return product_estimate, product_moe
 
 
+def approximate_product_batch(estimates_one, moes_one, estimates_two, moes_two):
+    """Calculate many products at once and approximate their margins of error.
+
+    A vectorized version of `approximate_product` for aggregating many rows without a Python loop.
+    Each argument is an array, or anything NumPy can turn into one, and the rows are matched up
+    element by element.
+
+    Args:
+        estimates_one (numpy.ndarray): The U.S. Census bureau estimates of the first factors.
+        moes_one (numpy.ndarray): The margins of error of the first factors.
+        estimates_two (numpy.ndarray): The U.S. Census bureau estimates of the second factors.
+        moes_two (numpy.ndarray): The margins of error of the second factors.
+
+    Returns:
+        A two-item tuple with an array of products followed by an array of their approximated
+        margins of error.
+
+        (array([61393365.888]), array([202288.98902721]))
+
+    Examples:
+        >>> approximate_product_batch([74506512], [228238], [0.824], [0.001])
+        (array([61393365.888]), array([202288.98902721]))
+    """
+    # Pull out the values
+    estimates_one = numpy.asarray(estimates_one, dtype=numpy.float64)
+    moes_one = numpy.asarray(moes_one, dtype=numpy.float64)
+    estimates_two = numpy.asarray(estimates_two, dtype=numpy.float64)
+    moes_two = numpy.asarray(moes_two, dtype=numpy.float64)
+
+    # Approximate the products
+    product_estimates = estimates_one * estimates_two
+
+    # Approximate the margins of error
+    squared_product_moes = (estimates_one * estimates_one * moes_two * moes_two) + (
+        estimates_two * estimates_two * moes_one * moes_one
+    )
+    product_moes = numpy.sqrt(squared_product_moes)
+
+    # Return the results
+    return product_estimates, product_moes
+
+
 def approximate_percentchange(pair_old, pair_new):
     """Calculates the percent change between two estimates and approximates its margin of error.
 
@@ -417,16 +1203,105 @@ def approximate_percentchange(pair_old, pair_new):
     # Approximate the percent change
     percent_change_estimate = ((estimate_new - estimate_old) / estimate_old) * 100
 
-    # Approximate the margin of error
-    percent_change_as_ratio = approximate_ratio(pair_new, pair_old)
-    decimal_change_moe = percent_change_as_ratio[1]
-    percent_change_moe = 100 * decimal_change_moe
+    # Approximate the margin of error the same way approximate_ratio would for new / old
+    ratio_estimate = estimate_new / estimate_old
+    percent_change_moe = (100 / estimate_old) * math.hypot(
+        moe_new, ratio_estimate * moe_old
+    )
 
     # Return the results
     return percent_change_estimate, percent_change_moe
 
 
-def approximate_mean(range_list, simulations=50, pareto=False):
+def approximate_percentchange_batch(estimates_old, moes_old, estimates_new, moes_new):
+    """Calculate many percent changes at once and approximate their margins of error.
+
+    A vectorized version of `approximate_percentchange` for aggregating many rows without a
+    Python loop. Each argument is an array, or anything NumPy can turn into one, and the rows are
+    matched up element by element. Multiplies results by 100.
+
+    Args:
+        estimates_old (numpy.ndarray): The earlier U.S. Census bureau estimates.
+        moes_old (numpy.ndarray): The margins of error of the earlier estimates.
+        estimates_new (numpy.ndarray): The later U.S. Census bureau estimates.
+        moes_new (numpy.ndarray): The margins of error of the later estimates.
+
+    Returns:
+        A two-item tuple with an array of percent changes followed by an array of their
+        approximated margins of error.
+
+        (array([3.05386431]), array([4.19806985]))
+
+    Examples:
+        >>> approximate_percentchange_batch([135173], [3860], [139301], [4047])
+        (array([3.05386431]), array([4.19806985]))
+    """
+    # Pull out the values
+    estimates_old = numpy.asarray(estimates_old, dtype=numpy.float64)
+    moes_old = numpy.asarray(moes_old, dtype=numpy.float64)
+    estimates_new = numpy.asarray(estimates_new, dtype=numpy.float64)
+    moes_new = numpy.asarray(moes_new, dtype=numpy.float64)
+
+    # Approximate the percent changes
+    percent_change_estimates = ((estimates_new - estimates_old) / estimates_old) * 100
+
+    # Approximate the margins of error the same way approximate_ratio_batch would for new / old
+    ratio_estimates = estimates_new / estimates_old
+    squared_ratio_moes = moes_new * moes_new + (
+        ratio_estimates * ratio_estimates * moes_old * moes_old
+    )
+    percent_change_moes = (100 / estimates_old) * numpy.sqrt(squared_ratio_moes)
+
+    # Return the results
+    return percent_change_estimates, percent_change_moes
+
+
+def _quantiles(values, probabilities):
+    """Calculate several quantiles of an array with one partial sort.
+
+    Matches the linear interpolation used by default in numpy.quantile, which sorts the
+    full array again on every call.
+    """
+    positions = (len(values) - 1) * numpy.asarray(probabilities, dtype=numpy.float64)
+    lower = numpy.floor(positions).astype(numpy.intp)
+    upper = numpy.minimum(lower + 1, len(values) - 1)
+    partitioned = numpy.partition(values, numpy.union1d(lower, upper))
+    return partitioned[lower] + (partitioned[upper] - partitioned[lower]) * (
+        positions - lower
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _thread_pool():
+    """Get the pool of threads that Pareto values are drawn in, with one thread for each processor.
+
+    Shared across calls so a new pool isn't started for every mean.
+    """
+    return concurrent.futures.ThreadPoolExecutor(os.cpu_count() or 1)
+
+
+# A forked process doesn't inherit the pool's threads, so it needs a pool of its own
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_thread_pool.cache_clear)
+
+
+def _pareto_sum(seed, alpha, n):
+    """Sum n values drawn from numpy's Pareto distribution by a generator with the submitted seed.
+
+    numpy releases the GIL while drawing, so calls can run in parallel threads. The values are drawn
+    and totaled a chunk at a time so a large bin doesn't need them all in memory at once.
+    """
+    rng = numpy.random.default_rng(seed)
+    n = int(n)
+    total = 0.0
+    for start in range(0, n, _PARETO_DRAW_CHUNK):
+        total += rng.pareto(a=alpha, size=min(_PARETO_DRAW_CHUNK, n - start)).sum()
+    return total
+
+
+def approximate_mean(
+    range_list, simulations=50, pareto=False, seed=None, method="simulation"
+):
     """Estimate a mean and approximate the margin of error.
 
     The Census Bureau guidelines do not provide instructions for
@@ -434,8 +1309,8 @@ def approximate_mean(range_list, simulations=50, pareto=False):
 
     Instead, we implement our own simulation-based approach.
 
-    Due to the stochastic nature of the simulation approach, you will need to set
-    a seed before running this function to ensure replicability.
+    Due to the stochastic nature of the simulation approach, you will need to pass
+    a seed to this function to ensure replicability.
 
     Note that this function expects you to submit a lower bound for the smallest
     bin and an upper bound for the largest bin. This is often not available for
@@ -444,6 +1319,7 @@ def approximate_mean(range_list, simulations=50, pareto=False):
 
     Args:
         range_list (list): A list of dictionaries that divide the full range of data values into continuous categories.
+            It can also be a dictionary of equal-length sequences, like NumPy arrays, for each key.
             Each dictionary should have four keys:
                 * min (int): The minimum value of the range
                 * max (int): The maximum value of the range
@@ -452,6 +1328,14 @@ def approximate_mean(range_list, simulations=50, pareto=False):
         simulations (int): number of simulations to run, used to estimate margin of error. Defaults to 50.
         pareto (logical): Set True to use the Pareto distribution to simulate values in upper bin.
             Set False to assume a uniform distribution. Pareto is often appropriate for income. Defaults to False.
+        seed (int or numpy.random.Generator, optional): Seeds the random number generator used by the
+            simulation so results can be replicated. A `numpy.random.Generator` is drawn from directly,
+            so one generator can be shared across calls. Defaults to None, which draws from a
+            generator shared by every call.
+        method (str, optional): Set to "analytic" to skip the simulation and approximate the margin of error
+            with the delta method, treating the number in each bin as normally distributed around n.
+            It returns the same answer every time and is much quicker, but with pareto=True it needs
+            a Pareto shape above two. Defaults to "simulation".
 
     Returns:
         A two-item tuple with the mean followed by the approximated margin of error.
@@ -484,71 +1368,134 @@ def approximate_mean(range_list, simulations=50, pareto=False):
         >>> approximate_mean(income, pareto=True)
         (60364.96525340687, 58.60735554621351)
     """
-    # Sort the list
-    range_list.sort(key=lambda x: x["min"])
+    # Pull the bins out into arrays sorted by their minimums so every simulation can be drawn at once
+    mins, maxs, ns, moes = _ingest(_columns(range_list, "min", "max", "n", "moe"))
+    n_bins = len(mins)
+    ses = moes / _Z90  # convert moe to se
+
+    # Values drawn uniformly within a bin average out at its midpoint
+    # and spread out with a variance of (max - min) ** 2 / 12
+    centers = (mins + maxs) / 2
+    widths = maxs - mins
+    spreads = widths * widths / 12
 
     if pareto:  # need shape parameter if using Pareto distribution
-        nb1 = range_list[-2]["n"]  # number in second to last bin
-        nb = range_list[-1]["n"]  # number in last bin
-        lb1 = range_list[-2]["min"]  # lower bound of second to last bin
-        lb = range_list[-1]["min"]  # lower bound of last bin
-        alpha_hat = (numpy.log(nb1 + nb) - numpy.log(nb)) / (
-            numpy.log(lb) - numpy.log(lb1)
+        nb1 = ns[-2]  # number in second to last bin
+        nb = ns[-1]  # number in last bin
+        lb1 = mins[-2]  # lower bound of second to last bin
+        lb = mins[-1]  # lower bound of last bin
+        alpha_hat = (math.log(nb1 + nb) - math.log(nb)) / (
+            math.log(lb) - math.log(lb1)
         )  # shape parameter for Pareto
 
-    simulation_results = []
-    for i in range(simulations):
-        simulated_values = []
-        simulated_n = []
-        # loop through every bin except the last one
-        for range_ in range_list[:-1]:
-            se = range_["moe"] / 1.645  # convert moe to se
-            nn = round(
-                numpy.random.normal(range_["n"], se)
-            )  # use moe to introduce randomness into number in bin
-            nn = int(nn)  # clean it up
-            simulated_values.append(
-                numpy.random.uniform(range_["min"], range_["max"], size=(1, nn)).sum()
-            )  # draw random values within the bin, assume uniform
-            simulated_n.append(nn)
-        # a special case to handle the last bin
+    if method == "analytic":
         if pareto:
-            last = range_list[-1]
-            se = last["moe"] / 1.645  # convert moe to se
-            nn = round(
-                numpy.random.normal(last["n"], se)
-            )  # use moe to introduce randomness into number in bin
-            nn = int(nn)  # clean it up
-            simulated_values.append(
-                numpy.random.pareto(a=alpha_hat, size=(1, nn)).sum()
-            )  # draw random values within the bin, assume uniform
-            simulated_n.append(nn)
-        # use uniform otherwise
+            # numpy's Pareto draws only have a finite variance when a > 2
+            if not alpha_hat > 2:
+                raise DataError(
+                    f"The Pareto shape {alpha_hat} is too small to approximate analytically. Use the simulation method instead."
+                )
+            centers[-1] = 1 / (alpha_hat - 1)
+            spreads[-1] = alpha_hat / (
+                (alpha_hat - 1) * (alpha_hat - 1) * (alpha_hat - 2)
+            )
+        n = ns.sum()
+        estimated_mean = (ns @ centers) / n
+
+        # The delta method's variance from the uncertain n in each bin, plus the spread of the values in the bins
+        deviations = (centers - estimated_mean) / n
+        variance = (deviations * deviations) @ (ses * ses) + (ns @ spreads) / (n * n)
+
+        # Return the result
+        return float(estimated_mean), float(_Z90 * math.sqrt(variance))
+    elif method != "simulation":
+        raise ValueError(
+            f"The method must be either 'simulation' or 'analytic', not {method!r}."
+        )
+
+    # Use a fresh generator when asked to replicate results
+    rng = _RNG if seed is None else numpy.random.default_rng(seed)
+
+    # use moe to introduce randomness into number in each bin, one row per simulation
+    simulated_n = rng.normal(ns, ses, size=(simulations, n_bins)).round().clip(0)
+
+    # The sum of nn values drawn uniformly within a bin is normally distributed
+    # with a mean of nn * (min + max) / 2 and a variance of nn * (max - min) ** 2 / 12,
+    # so there's no need to draw every value one at a time
+    noise = rng.standard_normal(simulated_n.shape)
+    simulated_values = simulated_n * centers + numpy.sqrt(simulated_n * spreads) * noise
+
+    # Except when there are too few of them for the approximation to hold,
+    # in which case every value gets drawn all at once and totaled up by bin
+    exact = simulated_n < _UNIFORM_APPROXIMATION_MIN_N
+    if pareto:
+        exact[:, -1] = False
+    if exact.any():
+        counts = simulated_n[exact].astype(numpy.intp)
+        cells = numpy.repeat(numpy.arange(len(counts)), counts)
+        unit_sums = numpy.bincount(
+            cells, weights=rng.random(len(cells)), minlength=len(counts)
+        )
+        simulated_values[exact] = (
+            counts * numpy.broadcast_to(mins, exact.shape)[exact]
+            + unit_sums * numpy.broadcast_to(widths, exact.shape)[exact]
+        )
+
+    # a special case to handle the last bin
+    if pareto:
+        nn = simulated_n[:, -1]
+        # A sum of Pareto draws is only close to normal when there are enough of them
+        # and the distribution has a finite variance
+        if alpha_hat > 2:
+            approximated = nn >= _PARETO_APPROXIMATION_MIN_N
+            # numpy's Pareto draws have a mean of 1 / (a - 1) and, when a > 2,
+            # a finite variance of a / ((a - 1) ** 2 * (a - 2))
+            pareto_mean = 1 / (alpha_hat - 1)
+            pareto_var = alpha_hat / (
+                (alpha_hat - 1) * (alpha_hat - 1) * (alpha_hat - 2)
+            )
+            simulated_values[approximated, -1] = nn[approximated] * pareto_mean + (
+                numpy.sqrt(nn[approximated] * pareto_var) * noise[approximated, -1]
+            )
         else:
-            last = range_list[-1]
-            se = last["moe"] / 1.645  # convert moe to se
-            nn = round(
-                numpy.random.normal(last["n"], se)
-            )  # use moe to introduce randomness into number in bin
-            nn = int(nn)  # clean it up
-            simulated_values.append(
-                numpy.random.uniform(last["min"], last["max"], size=(1, nn)).sum()
-            )  # draw random values within the bin, assume uniform
-            simulated_n.append(nn)
-        simulation_results.append(
-            sum(simulated_values) / sum(simulated_n)
-        )  # calculate mean for replicate
-
-    estimated_mean = numpy.mean(simulation_results)  # calculate overall mean
+            approximated = numpy.zeros(simulations, dtype=bool)
+        # Otherwise we have to draw every value
+        drawn = numpy.flatnonzero(~approximated)
+        if len(drawn):
+            counts = nn[drawn].astype(numpy.intp)
+            if counts.sum() < _PARETO_APPROXIMATION_MIN_N:
+                # A few values are quickest drawn all at once and totaled up by simulation
+                cells = numpy.repeat(numpy.arange(len(counts)), counts)
+                sums = numpy.bincount(
+                    cells,
+                    weights=rng.pareto(a=alpha_hat, size=len(cells)),
+                    minlength=len(counts),
+                )
+            else:
+                # Each simulation gets its own generator so they can be drawn on separate threads
+                seeds = rng.integers(2**63, size=len(drawn))
+                alphas = [alpha_hat] * len(drawn)
+                sums = list(_thread_pool().map(_pareto_sum, seeds, alphas, nn[drawn]))
+            simulated_values[drawn, -1] = sums
+
+    # calculate mean for each replicate
+    simulation_results = simulated_values.sum(axis=1) / simulated_n.sum(axis=1)
+
+    estimated_mean = math.fsum(simulation_results.tolist()) / len(
+        simulation_results
+    )  # calculate overall mean
+    lower_quantile, upper_quantile = _quantiles(
+        simulation_results, (0.05, 0.95)
+    )  # both ends of the confidence interval from a single partial sort
     moe_right = (
-        numpy.quantile(simulation_results, 0.95) - estimated_mean
+        upper_quantile - estimated_mean
     )  # go from confidence interval to margin of error
-    moe_left = estimated_mean - numpy.quantile(
-        simulation_results, 0.05
+    moe_left = (
+        estimated_mean - lower_quantile
     )  # go from confidence interval to margin of error
     margin_of_error = max(
         moe_left, moe_right
     )  # if asymmetrical take bigger one, conservative
 
     # Return the result
-    return estimated_mean, margin_of_error
+    return estimated_mean, float(margin_of_error)
@@ -49,6 +49,9 @@ setup(
     install_requires=[
         "numpy",
     ],
+    extras_require={
+        "numba": ["numba"],
+    },
     use_scm_version={"version_scheme": version_scheme, "local_scheme": local_version},
     classifiers=[
         "Development Status :: 5 - Production/Stable",
@@ -1,12 +1,70 @@
 #! /usr/bin/env python
 import doctest
 import unittest
+import warnings
 
 import numpy
 
 import census_data_aggregator
 from census_data_aggregator.exceptions import DataError, SamplingPercentageWarning
 
+household_income_Los_Angeles_County_2013_acs5 = [
+    dict(min=2499, max=9999, n=209050),
+    dict(min=10000, max=14999, n=190300),
+    dict(min=15000, max=19999, n=173380),
+    dict(min=20000, max=24999, n=167740),
+    dict(min=25000, max=29999, n=154347),
+    dict(min=30000, max=34999, n=155834),
+    dict(min=35000, max=39999, n=143103),
+    dict(min=40000, max=44999, n=140946),
+    dict(min=45000, max=49999, n=126807),
+    dict(min=50000, max=59999, n=241482),
+    dict(min=60000, max=74999, n=303887),
+    dict(min=75000, max=99999, n=384881),
+    dict(min=100000, max=124999, n=268689),
+    dict(min=125000, max=149999, n=169129),
+    dict(min=150000, max=199999, n=189195),
+    dict(min=200000, max=250001, n=211613),
+]
+
+household_income_Los_Angeles_County_2013_acs3 = [
+    dict(min=2499, max=9999, n=222966),
+    dict(min=10000, max=14999, n=197354),
+    dict(min=15000, max=19999, n=178836),
+    dict(min=20000, max=24999, n=177895),
+    dict(min=25000, max=29999, n=155399),
+    dict(min=30000, max=34999, n=156869),
+    dict(min=35000, max=39999, n=145396),
+    dict(min=40000, max=44999, n=141772),
+    dict(min=45000, max=49999, n=125984),
+    dict(min=50000, max=59999, n=237511),
+    dict(min=60000, max=74999, n=303531),
+    dict(min=75000, max=99999, n=371986),
+    dict(min=100000, max=124999, n=264049),
+    dict(min=125000, max=149999, n=164391),
+    dict(min=150000, max=199999, n=179788),
+    dict(min=200000, max=250001, n=209815),
+]
+
+household_income_la_2013_acs1 = [
+    dict(min=2499, max=9999, n=1382),
+    dict(min=10000, max=14999, n=2377),
+    dict(min=15000, max=19999, n=1332),
+    dict(min=20000, max=24999, n=3129),
+    dict(min=25000, max=29999, n=1927),
+    dict(min=30000, max=34999, n=1825),
+    dict(min=35000, max=39999, n=1567),
+    dict(min=40000, max=44999, n=1996),
+    dict(min=45000, max=49999, n=1757),
+    dict(min=50000, max=59999, n=3523),
+    dict(min=60000, max=74999, n=4360),
+    dict(min=75000, max=99999, n=6424),
+    dict(min=100000, max=124999, n=5257),
+    dict(min=125000, max=149999, n=3485),
+    dict(min=150000, max=199999, n=2926),
+    dict(min=200000, max=250001, n=4215),
+]
+
 
 class CensusErrorAnalyzerTest(unittest.TestCase):
     def test_sum(self):
@@ -26,6 +84,16 @@ class CensusErrorAnalyzerTest(unittest.TestCase):
             ),
             (41, 47.01063709417264),
         )
+        # With a single zero, whose margin is kept like any other
+        self.assertEqual(
+            census_data_aggregator.approximate_sum([0, 30], [41, 40]),
+            (41, 50.0),
+        )
+        # With nothing but zeros
+        self.assertEqual(
+            census_data_aggregator.approximate_sum([0, 3], [0, 4]),
+            (0, 4.0),
+        )
         # From the ACS handbook examples
         single_women = ((135173, 3860), (43104, 2642), (24842, 1957))
         self.assertEqual(
@@ -33,26 +101,21 @@ class CensusErrorAnalyzerTest(unittest.TestCase):
             (203119, 5070.4647715963865),
         )
 
-    def test_median(self):
-        household_income_Los_Angeles_County_2013_acs5 = [
-            dict(min=2499, max=9999, n=209050),
-            dict(min=10000, max=14999, n=190300),
-            dict(min=15000, max=19999, n=173380),
-            dict(min=20000, max=24999, n=167740),
-            dict(min=25000, max=29999, n=154347),
-            dict(min=30000, max=34999, n=155834),
-            dict(min=35000, max=39999, n=143103),
-            dict(min=40000, max=44999, n=140946),
-            dict(min=45000, max=49999, n=126807),
-            dict(min=50000, max=59999, n=241482),
-            dict(min=60000, max=74999, n=303887),
-            dict(min=75000, max=99999, n=384881),
-            dict(min=100000, max=124999, n=268689),
-            dict(min=125000, max=149999, n=169129),
-            dict(min=150000, max=199999, n=189195),
-            dict(min=200000, max=250001, n=211613),
-        ]
+        # Enough pairs to be summed with NumPy
+        many_pairs = [(i % 7, i % 11 + 1) for i in range(200)]
+        zero_margins = [m for e, m in many_pairs if e == 0]
+        squared_margins = sum(m * m for e, m in many_pairs if e != 0)
+        total, moe = census_data_aggregator.approximate_sum(*many_pairs)
+        self.assertEqual(total, sum(e for e, m in many_pairs))
+        self.assertIsInstance(total, int)
+        self.assertAlmostEqual(moe, (squared_margins + max(zero_margins) ** 2) ** 0.5)
+        # Even when the margins aren't whole numbers
+        total, moe = census_data_aggregator.approximate_sum(
+            *[(e, m + 0.5) for e, m in many_pairs]
+        )
+        self.assertIsInstance(total, int)
 
+    def test_median(self):
         self.assertEqual(
             census_data_aggregator.approximate_median(
                 household_income_Los_Angeles_County_2013_acs5,
@@ -61,24 +124,18 @@ class CensusErrorAnalyzerTest(unittest.TestCase):
             (56363.58534176461, 161.96723586588095),
         )
 
-        household_income_Los_Angeles_County_2013_acs3 = [
-            dict(min=2499, max=9999, n=222966),
-            dict(min=10000, max=14999, n=197354),
-            dict(min=15000, max=19999, n=178836),
-            dict(min=20000, max=24999, n=177895),
-            dict(min=25000, max=29999, n=155399),
-            dict(min=30000, max=34999, n=156869),
-            dict(min=35000, max=39999, n=145396),
-            dict(min=40000, max=44999, n=141772),
-            dict(min=45000, max=49999, n=125984),
-            dict(min=50000, max=59999, n=237511),
-            dict(min=60000, max=74999, n=303531),
-            dict(min=75000, max=99999, n=371986),
-            dict(min=100000, max=124999, n=264049),
-            dict(min=125000, max=149999, n=164391),
-            dict(min=150000, max=199999, n=179788),
-            dict(min=200000, max=250001, n=209815),
-        ]
+        # Order shouldn't matter, and the submitted list should be left alone
+        shuffled = household_income_Los_Angeles_County_2013_acs5[8:]
+        shuffled += household_income_Los_Angeles_County_2013_acs5[:8]
+        shuffled_copy = [dict(d) for d in shuffled]
+        self.assertEqual(
+            census_data_aggregator.approximate_median(
+                shuffled,
+                sampling_percentage=2.5 * 5,
+            ),
+            (56363.58534176461, 161.96723586588095),
+        )
+        self.assertEqual(shuffled, shuffled_copy)
 
         self.assertEqual(
             census_data_aggregator.approximate_median(
@@ -88,25 +145,6 @@ class CensusErrorAnalyzerTest(unittest.TestCase):
             (54811.92744757085, 218.6913805834877),
         )
 
-        household_income_la_2013_acs1 = [
-            dict(min=2499, max=9999, n=1382),
-            dict(min=10000, max=14999, n=2377),
-            dict(min=15000, max=19999, n=1332),
-            dict(min=20000, max=24999, n=3129),
-            dict(min=25000, max=29999, n=1927),
-            dict(min=30000, max=34999, n=1825),
-            dict(min=35000, max=39999, n=1567),
-            dict(min=40000, max=44999, n=1996),
-            dict(min=45000, max=49999, n=1757),
-            dict(min=50000, max=59999, n=3523),
-            dict(min=60000, max=74999, n=4360),
-            dict(min=75000, max=99999, n=6424),
-            dict(min=100000, max=124999, n=5257),
-            dict(min=125000, max=149999, n=3485),
-            dict(min=150000, max=199999, n=2926),
-            dict(min=200000, max=250001, n=4215),
-        ]
-
         self.assertEqual(
             census_data_aggregator.approximate_median(
                 household_income_la_2013_acs1, sampling_percentage=2.5
@@ -114,11 +152,21 @@ class CensusErrorAnalyzerTest(unittest.TestCase):
             (70065.84266055046, 3850.680465234964),
         )
 
-        with self.assertWarns(SamplingPercentageWarning):
+        # Without a sampling percentage there should be a warning, even from the cache
+        for attempt in range(2):
+            with self.assertWarns(SamplingPercentageWarning):
+                m, moe = census_data_aggregator.approximate_median(
+                    household_income_Los_Angeles_County_2013_acs5, design_factor=1.5
+                )
+                self.assertTrue(moe is None)
+        # Unless it's been turned off
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
             m, moe = census_data_aggregator.approximate_median(
-                household_income_Los_Angeles_County_2013_acs5, design_factor=1.5
+                household_income_Los_Angeles_County_2013_acs5, warn=False
             )
             self.assertTrue(moe is None)
+        self.assertEqual(caught, [])
         # Test a sample size so small the p values fail
         with self.assertRaises(DataError):
             bad_data = [
@@ -131,6 +179,26 @@ class CensusErrorAnalyzerTest(unittest.TestCase):
                 bad_data, design_factor=1.5, sampling_percentage=1
             )
 
+        # Test ranges without anything in them
+        with self.assertRaises(DataError):
+            census_data_aggregator.approximate_median([])
+        with self.assertRaises(DataError):
+            census_data_aggregator.approximate_median(
+                [dict(min=0, max=49999, n=0), dict(min=50000, max=99999, n=0)]
+            )
+
+        # Test empty ranges at the bottom, where a lower p value of zero lands
+        self.assertEqual(
+            census_data_aggregator.approximate_median(
+                [
+                    dict(min=0, max=9, n=0),
+                    dict(min=10, max=19, n=99),
+                ],
+                sampling_percentage=1,
+            ),
+            (14.5, 7.4025),
+        )
+
         top_median = [
             dict(min=0, max=49999, n=50),
             dict(min=50000, max=99999, n=50),
@@ -141,6 +209,235 @@ class CensusErrorAnalyzerTest(unittest.TestCase):
             top_median, design_factor=1.5, sampling_percentage=1
         )
 
+        # Columns of values should work the same as a list of dictionaries
+        columns = {
+            key: numpy.array([r[key] for r in shuffled]) for key in ("min", "max", "n")
+        }
+        self.assertEqual(
+            census_data_aggregator.approximate_median(
+                columns, design_factor=1.5, sampling_percentage=2.5
+            ),
+            census_data_aggregator.approximate_median(
+                household_income_Los_Angeles_County_2013_acs5,
+                design_factor=1.5,
+                sampling_percentage=2.5,
+            ),
+        )
+        # Long lists are worked through with arrays rather than in pure Python, with the same results.
+        # Empty ranges below the rest don't move the median or its margin of error.
+        padded = [
+            dict(min=-1000 * (i + 1), max=-1000 * i - 1, n=0) for i in range(70)
+        ] + household_income_Los_Angeles_County_2013_acs5
+        self.assertEqual(
+            census_data_aggregator.approximate_median(
+                padded, design_factor=1.5, sampling_percentage=2.5
+            ),
+            census_data_aggregator.approximate_median(
+                household_income_Los_Angeles_County_2013_acs5,
+                design_factor=1.5,
+                sampling_percentage=2.5,
+            ),
+        )
+        # As long as there's a value in every column for every range
+        for key in ("max", "n"):
+            with self.assertRaises(DataError):
+                census_data_aggregator.approximate_median(
+                    dict(columns, **{key: columns[key][:-1]}), sampling_percentage=2.5
+                )
+        with self.assertRaises(DataError):
+            census_data_aggregator.approximate_median(
+                dict(
+                    min=[0, 50000, 100000],
+                    max=[49999, 99999, 250001],
+                    n=[1200, 800, 400, 999999],
+                ),
+                sampling_percentage=2.5,
+            )
+
+        # Sampling percentages outside (0, 100] have no standard error
+        for sampling_percentage in (-5, 150):
+            with self.assertRaises(ValueError):
+                census_data_aggregator.approximate_median(
+                    household_income_Los_Angeles_County_2013_acs5,
+                    sampling_percentage=sampling_percentage,
+                )
+            with self.assertRaises(ValueError):
+                census_data_aggregator.approximate_median_batch(
+                    [0, 50000],
+                    [49999, 250001],
+                    [[10, 20]],
+                    sampling_percentage=sampling_percentage,
+                )
+
+    def test_make_median_estimator(self):
+        # An estimator with its inputs fixed should match the one-off function
+        estimate_median = census_data_aggregator.make_median_estimator(
+            design_factor=1.5, sampling_percentage=2.5
+        )
+        for range_list in (
+            household_income_Los_Angeles_County_2013_acs5,
+            household_income_Los_Angeles_County_2013_acs3,
+            household_income_la_2013_acs1,
+        ):
+            self.assertEqual(
+                estimate_median(range_list),
+                census_data_aggregator.approximate_median(
+                    range_list, design_factor=1.5, sampling_percentage=2.5
+                ),
+            )
+        with self.assertRaises(DataError):
+            estimate_median(
+                [
+                    dict(min=0, max=49999, n=5),
+                    dict(min=50000, max=99999, n=5),
+                    dict(min=100000, max=199999, n=5),
+                    dict(min=200000, max=250001, n=5),
+                ]
+            )
+        with self.assertWarns(SamplingPercentageWarning):
+            m, moe = census_data_aggregator.make_median_estimator()(
+                household_income_la_2013_acs1
+            )
+            self.assertTrue(moe is None)
+
+    def test_median_prepared(self):
+        # Prepared ranges can be reused with different inputs
+        shuffled = household_income_Los_Angeles_County_2013_acs5[::-1]
+        prepared = census_data_aggregator.prepare_range_list(shuffled)
+        for sampling_percentage in (1, 2.5, 12.5):
+            self.assertEqual(
+                census_data_aggregator.approximate_median_prepared(
+                    prepared, design_factor=1.5, sampling_percentage=sampling_percentage
+                ),
+                census_data_aggregator.approximate_median(
+                    household_income_Los_Angeles_County_2013_acs5,
+                    design_factor=1.5,
+                    sampling_percentage=sampling_percentage,
+                ),
+            )
+        with self.assertWarns(SamplingPercentageWarning):
+            m, moe = census_data_aggregator.approximate_median_prepared(prepared)
+            self.assertTrue(moe is None)
+        with self.assertRaises(DataError):
+            census_data_aggregator.prepare_range_list([])
+
+    def test_percentiles(self):
+        # Percentiles from the same ranges, with the median among them
+        quartiles = census_data_aggregator.approximate_percentiles(
+            household_income_Los_Angeles_County_2013_acs5,
+            [25, 50, 75],
+            design_factor=1.5,
+            sampling_percentage=2.5,
+        )
+        self.assertEqual(
+            quartiles[1],
+            census_data_aggregator.approximate_median(
+                household_income_Los_Angeles_County_2013_acs5,
+                design_factor=1.5,
+                sampling_percentage=2.5,
+            ),
+        )
+        self.assertLess(quartiles[0][0], quartiles[1][0])
+        self.assertLess(quartiles[1][0], quartiles[2][0])
+        with self.assertRaises(ValueError):
+            census_data_aggregator.approximate_percentiles(
+                household_income_Los_Angeles_County_2013_acs5,
+                [100],
+                sampling_percentage=2.5,
+            )
+
+    def test_median_many(self):
+        # Many range lists at once, in other processes or this one
+        range_lists = [
+            household_income_Los_Angeles_County_2013_acs5,
+            household_income_Los_Angeles_County_2013_acs3,
+            household_income_la_2013_acs1,
+        ]
+        expected = [
+            census_data_aggregator.approximate_median(
+                range_list, design_factor=1.5, sampling_percentage=12.5
+            )
+            for range_list in range_lists
+        ]
+        for workers in (1, 2):
+            self.assertEqual(
+                census_data_aggregator.approximate_median_many(
+                    range_lists,
+                    design_factor=1.5,
+                    sampling_percentage=12.5,
+                    workers=workers,
+                ),
+                expected,
+            )
+        with self.assertWarns(SamplingPercentageWarning):
+            medians = census_data_aggregator.approximate_median_many(
+                range_lists, workers=2
+            )
+            self.assertEqual([moe for m, moe in medians], [None, None, None])
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            census_data_aggregator.approximate_median_many(range_lists, warn=False)
+        self.assertEqual(caught, [])
+
+    def test_median_batch(self):
+        # The same ranges for many rows at once
+        range_list = household_income_Los_Angeles_County_2013_acs5
+        expected = census_data_aggregator.approximate_median(
+            range_list, design_factor=1.5, sampling_percentage=12.5
+        )
+        medians, moes = census_data_aggregator.approximate_median_batch(
+            [r["min"] for r in range_list],
+            [r["max"] for r in range_list],
+            [[r["n"] for r in range_list], [r["n"] for r in range_list]],
+            design_factor=1.5,
+            sampling_percentage=12.5,
+        )
+        self.assertEqual(list(zip(medians, moes)), [expected, expected])
+
+        # Test a sample size so small the p values fail
+        mins = [0, 50000, 100000, 200000]
+        maxs = [49999, 99999, 199999, 250001]
+        with self.assertRaises(DataError):
+            census_data_aggregator.approximate_median_batch(
+                mins, maxs, [[5, 5, 5, 5]], design_factor=1.5, sampling_percentage=1
+            )
+        medians, moes = census_data_aggregator.approximate_median_batch(
+            mins,
+            maxs,
+            [[5, 5, 5, 5], [500, 500, 500, 500], [0, 0, 0, 0]],
+            design_factor=1.5,
+            sampling_percentage=1,
+            raise_errors=False,
+        )
+        self.assertTrue(numpy.isnan(moes[0]))
+        self.assertFalse(numpy.isnan(moes[1]))
+        self.assertEqual(
+            (medians[1], moes[1]),
+            census_data_aggregator.approximate_median(
+                [dict(min=a, max=b, n=500) for a, b in zip(mins, maxs)],
+                design_factor=1.5,
+                sampling_percentage=1,
+            ),
+        )
+        # Rows without any observations get NaN for both
+        self.assertTrue(numpy.isnan(medians[2]))
+        self.assertTrue(numpy.isnan(moes[2]))
+        with self.assertRaises(DataError):
+            census_data_aggregator.approximate_median_batch(
+                mins, maxs, [[500, 500, 500, 500], [0, 0, 0, 0]], sampling_percentage=1
+            )
+
+        # Every row needs an n for each range
+        for ns in ([[5, 5, 5, 5, 999999]], [5, 5, 5, 5]):
+            with self.assertRaises(DataError):
+                census_data_aggregator.approximate_median_batch(
+                    mins, maxs, ns, sampling_percentage=2.5
+                )
+        with self.assertRaises(DataError):
+            census_data_aggregator.approximate_median_batch(
+                mins, maxs[:-1], [[5, 5, 5, 5]], sampling_percentage=2.5
+            )
+
     def test_percentchange(self):
         estimate, moe = census_data_aggregator.approximate_percentchange(
             (135173, 3860), (139301, 4047)
@@ -219,6 +516,102 @@ class CensusErrorAnalyzerTest(unittest.TestCase):
         self.assertAlmostEqual(num_1unit_det_oou_est, 61393366, places=0)
         self.assertAlmostEqual(num_1unit_det_oou_moe, 202289, places=0)
 
+    def test_batch_ch8(self):
+        # Numerators and denominators from Tables 8.4 and 8.5, one row per example
+        numerator_estimates = [203119, 226840]
+        numerator_moes = [5070, 5556]
+        denominator_estimates = [630498, 203119]
+        denominator_moes = [837, 5070]
+
+        (
+            proportions,
+            proportion_moes,
+        ) = census_data_aggregator.approximate_proportion_batch(
+            numerator_estimates[:1],
+            numerator_moes[:1],
+            denominator_estimates[:1],
+            denominator_moes[:1],
+        )
+        self.assertAlmostEqual(proportions[0], 0.322, places=3)
+        self.assertAlmostEqual(proportion_moes[0], 0.008, places=3)
+
+        with self.assertRaises(DataError):
+            census_data_aggregator.approximate_proportion_batch(
+                denominator_estimates[:1],
+                denominator_moes[:1],
+                numerator_estimates[:1],
+                numerator_moes[:1],
+            )
+        # Or mark those rows with NaN instead
+        (
+            proportions,
+            proportion_moes,
+        ) = census_data_aggregator.approximate_proportion_batch(
+            numerator_estimates[:1] + denominator_estimates[:1],
+            numerator_moes[:1] + denominator_moes[:1],
+            denominator_estimates[:1] + numerator_estimates[:1],
+            denominator_moes[:1] + numerator_moes[:1],
+            raise_errors=False,
+        )
+        self.assertAlmostEqual(proportion_moes[0], 0.008, places=3)
+        self.assertTrue(numpy.isnan(proportion_moes[1]))
+
+        batches = [
+            (
+                census_data_aggregator.approximate_ratio,
+                census_data_aggregator.approximate_ratio_batch,
+            ),
+            (
+                census_data_aggregator.approximate_product,
+                census_data_aggregator.approximate_product_batch,
+            ),
+            (
+                census_data_aggregator.approximate_percentchange,
+                census_data_aggregator.approximate_percentchange_batch,
+            ),
+        ]
+        for scalar, batch in batches:
+            estimates, moes = batch(
+                numerator_estimates,
+                numerator_moes,
+                denominator_estimates,
+                denominator_moes,
+            )
+            for i in range(len(numerator_estimates)):
+                estimate, moe = scalar(
+                    (numerator_estimates[i], numerator_moes[i]),
+                    (denominator_estimates[i], denominator_moes[i]),
+                )
+                self.assertAlmostEqual(estimates[i], estimate)
+                self.assertAlmostEqual(moes[i], moe)
+
+        # Sums, with and without zero estimates, one row per group
+        groups = [
+            [(135173, 3860), (43104, 2642), (24842, 1957)],
+            [(0, 22), (0, 29), (41, 37)],
+            [(0, 30), (41, 40), (0, 0)],
+        ]
+        totals, moes = census_data_aggregator.approximate_sum_batch(
+            [[e for e, m in group] for group in groups],
+            [[m for e, m in group] for group in groups],
+        )
+        for i, group in enumerate(groups):
+            total, moe = census_data_aggregator.approximate_sum(*group)
+            self.assertEqual(totals[i], total)
+            self.assertAlmostEqual(moes[i], moe)
+
+        # The same pairs as a flat list tagged with unsorted group ids
+        pairs = [(p, i) for i, group in enumerate(groups) for p in group][::-1]
+        totals, moes = census_data_aggregator.approximate_sum_batch(
+            [e for (e, m), i in pairs],
+            [m for (e, m), i in pairs],
+            group_ids=[i for p, i in pairs],
+        )
+        for i, group in enumerate(groups):
+            total, moe = census_data_aggregator.approximate_sum(*group)
+            self.assertEqual(totals[i], total)
+            self.assertAlmostEqual(moes[i], moe)
+
     def test_mean(self):
         range_list = [
             dict(min=0, max=9999, n=7942251, moe=17662),
@@ -238,19 +631,100 @@ class CensusErrorAnalyzerTest(unittest.TestCase):
             dict(min=150000, max=199999, n=6931136, moe=37236),
             dict(min=200000, max=1000000, n=7465517, moe=42206),
         ]
-        numpy.random.seed(711355)
         # Calculate the mean and its MOE
-        mean, moe = census_data_aggregator.approximate_mean(range_list)
+        mean, moe = census_data_aggregator.approximate_mean(range_list, seed=711355)
 
-        self.assertAlmostEqual(mean, 98045.44530685373, places=3)
-        self.assertAlmostEqual(moe, 194.54892406267754, places=3)
+        self.assertAlmostEqual(mean, 98059.6405165816, places=3)
+        self.assertAlmostEqual(moe, 185.71123696789437, places=3)
+        # Both methods return plain floats
+        self.assertIs(type(mean), float)
+        self.assertIs(type(moe), float)
+
+        mean, moe = census_data_aggregator.approximate_mean(
+            range_list, pareto=True, seed=711355
+        )
 
-        numpy.random.seed(711355)
+        self.assertAlmostEqual(mean, 60365.46511067164, places=3)
+        self.assertAlmostEqual(moe, 53.53398865697818, places=3)
 
-        mean, moe = census_data_aggregator.approximate_mean(range_list, pareto=True)
+        # A generator of our own should draw the same as seeding one
+        self.assertEqual(
+            census_data_aggregator.approximate_mean(
+                range_list, pareto=True, seed=numpy.random.default_rng(711355)
+            ),
+            (mean, moe),
+        )
 
-        self.assertAlmostEqual(mean, 60364.96525340687, places=3)
-        self.assertAlmostEqual(moe, 58.60735554621351, places=3)
+        # The analytic method should land close to a long simulation without running one
+        mean, moe = census_data_aggregator.approximate_mean(
+            range_list, method="analytic"
+        )
+        self.assertIs(type(mean), float)
+        self.assertIs(type(moe), float)
+        self.assertAlmostEqual(mean, 98063.02033457835, places=3)
+        self.assertAlmostEqual(moe, 183.5961337502139, places=3)
+
+        mean, moe = census_data_aggregator.approximate_mean(
+            range_list, pareto=True, method="analytic"
+        )
+        self.assertAlmostEqual(mean, 60366.66298855115, places=3)
+        self.assertAlmostEqual(moe, 56.2289431329697, places=3)
+
+        with self.assertRaises(ValueError):
+            census_data_aggregator.approximate_mean(range_list, method="bootstrap")
+
+        # Columns of values should work the same as a list of dictionaries
+        columns = {
+            key: numpy.array([r[key] for r in range_list])
+            for key in ("min", "max", "n", "moe")
+        }
+        self.assertEqual(
+            census_data_aggregator.approximate_mean(columns, seed=711355),
+            census_data_aggregator.approximate_mean(range_list, seed=711355),
+        )
+        with self.assertRaises(DataError):
+            census_data_aggregator.approximate_mean(
+                dict(columns, moe=columns["moe"][:-1]), seed=711355
+            )
+
+        # A single value in a bin should be drawn exactly, so its mean's interval is
+        # the middle 90% of the bin rather than a normal approximation's wider one
+        mean, moe = census_data_aggregator.approximate_mean(
+            [dict(min=0, max=10, n=1, moe=0)], simulations=2000, seed=711355
+        )
+        self.assertAlmostEqual(moe, 4.5, delta=0.15)
+
+    def test_mean_pareto_draws(self):
+        # Top bins with a Pareto shape of two or less can't be approximated, so every value gets drawn.
+        # The expected means come from the original value-by-value simulation, after numpy.random.seed(711355).
+        # Enough values in the top bin are drawn on separate threads, a generator for each simulation
+        threaded = [
+            dict(min=0, max=49999, n=20000, moe=500),
+            dict(min=50000, max=99999, n=30000, moe=600),
+            dict(min=100000, max=199999, n=20000, moe=400),
+            dict(min=200000, max=1000000, n=12000, moe=300),
+        ]
+        # While a few, here about 50 simulations of 150, are drawn all at once
+        small = [
+            dict(min=0, max=49999, n=300, moe=30),
+            dict(min=50000, max=99999, n=200, moe=20),
+            dict(min=100000, max=199999, n=200, moe=20),
+            dict(min=200000, max=1000000, n=150, moe=15),
+        ]
+        for range_list, baseline_mean in (
+            (threaded, 70125.65730375654),
+            (small, 61951.51149929551),
+        ):
+            mean, moe = census_data_aggregator.approximate_mean(
+                range_list, pareto=True, seed=711355
+            )
+            self.assertEqual(
+                census_data_aggregator.approximate_mean(
+                    range_list, pareto=True, seed=711355
+                ),
+                (mean, moe),
+            )
+            self.assertAlmostEqual(mean, baseline_mean, delta=moe)
 
     def test_mean_order(self):
         range_list = [
@@ -271,19 +745,18 @@ class CensusErrorAnalyzerTest(unittest.TestCase):
             dict(min=40000, max=44999, n=5354520, moe=15415),
             dict(min=45000, max=49999, n=4725195, moe=16890),
         ]
-        numpy.random.seed(711355)
         # Calculate the mean and its MOE
-        mean, moe = census_data_aggregator.approximate_mean(range_list)
+        mean, moe = census_data_aggregator.approximate_mean(range_list, seed=711355)
 
-        self.assertAlmostEqual(mean, 98045.44530685373, places=3)
-        self.assertAlmostEqual(moe, 194.54892406267754, places=3)
+        self.assertAlmostEqual(mean, 98059.6405165816, places=3)
+        self.assertAlmostEqual(moe, 185.71123696789437, places=3)
 
-        numpy.random.seed(711355)
-
-        mean, moe = census_data_aggregator.approximate_mean(range_list, pareto=True)
+        mean, moe = census_data_aggregator.approximate_mean(
+            range_list, pareto=True, seed=711355
+        )
 
-        self.assertAlmostEqual(mean, 60364.96525340687, places=3)
-        self.assertAlmostEqual(moe, 58.60735554621351, places=3)
+        self.assertAlmostEqual(mean, 60365.46511067164, places=3)
+        self.assertAlmostEqual(moe, 53.53398865697818, places=3)
 
 
 if __name__ == "__main__":